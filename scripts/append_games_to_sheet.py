@@ -1,11 +1,17 @@
 #!/usr/bin/env python3
 import argparse
-import json
+import csv
 import os
-from typing import List, Tuple, Set
+from http import HTTPStatus
+from typing import List, Set
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pac
 import gspread
+import orjson
+from gspread.exceptions import APIError, SpreadsheetNotFound, WorksheetNotFound
+from gspread.utils import absolute_range_name
 from google.oauth2.service_account import Credentials
 
 SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
@@ -20,33 +26,134 @@ CSV_COLS = [
 ]
 
 def get_client():
-    sa_json = json.loads(os.environ["GOOGLE_SA_JSON"])
+    sa_json = orjson.loads(os.environ["GOOGLE_SA_JSON"])
     creds = Credentials.from_service_account_info(sa_json, scopes=SCOPES)
     return gspread.authorize(creds)
 
+# Cell values treated as blank (compared after strip + lower)
+_NULL_STRS = frozenset({"nan", "none", "null", ""})
+
 def normalize(x) -> str:
-    if x is None:
-        return ""
-    s = str(x).strip()
-    return "" if s.lower() in ("nan", "none", "null") else s
+    s = "" if x is None else str(x).strip()
+    return s if s.lower() not in _NULL_STRS else ""
+
+def normalize_col(col: pd.Series) -> pd.Series:
+    s = col.fillna("").astype(str).str.strip()
+    return s.mask(s.str.lower().isin(_NULL_STRS), "")
+
+def normalize_df(df: pd.DataFrame) -> pd.DataFrame:
+    """Apply normalize_col to every column."""
+    out = df.copy()
+    for c in out.columns:
+        out[c] = normalize_col(out[c])
+    return out
 
-def row_key(vals: List[str]) -> Tuple[str, ...]:
-    # Use all 6 A–F cells as the identity of a row
-    return tuple(normalize(v) for v in vals)
+# Arrow's default null tokens plus the None/Null spellings it doesn't cover
+_CSV_NULL_VALUES = pac.ConvertOptions().null_values + ["None", "none", "NONE", "Null", "NAN"]
 
-def last_nonempty_row_in_col_a(ws) -> int:
+def read_csv_str(path: str) -> pd.DataFrame:
     """
-    Robustly find last non-empty row in column A by scanning A:A.
+    Parse the CSV with PyArrow, keeping every column as strings (empty/NA-like cells become nulls).
+    """
+    with open(path, newline="") as f:
+        header = next(csv.reader(f), [])
+    opts = pac.ConvertOptions(column_types={c: pa.string() for c in header}, strings_can_be_null=True,
+                               null_values=_CSV_NULL_VALUES)
+    return pac.read_csv(path, convert_options=opts).to_pandas(types_mapper=pd.ArrowDtype)
+
+def row_keys(df: pd.DataFrame) -> pd.Series:
+    # Use all 6 A–F cells (already normalized) as the identity of a row
+    return df[CSV_COLS[0]].str.cat([df[c] for c in CSV_COLS[1:]], sep="\x1f")
+
+def last_nonempty_row_in_col_a(col: List[List[str]]) -> int:
+    """
+    Robustly find last non-empty row in column A by reverse-scanning A:A.
     Avoids issues when other columns have formulas far down.
     """
-    col = ws.get("A:A")  # list of rows, each like ["value"]
-    last = 0
-    for i, row in enumerate(col, start=1):
-        v = row[0] if row else ""
-        if normalize(v) != "":
-            last = i
+    # Sheets already trims trailing empty rows, so walk back from the end
+    # instead of scanning the whole column.
+    last = len(col)
+    while last and normalize(col[last - 1][0] if col[last - 1] else "") == "":
+        last -= 1
     return last
 
+def read_col_a(sh, tab: str) -> List[List[str]]:
+    """Column A only (list of rows, each like ["value"]), to keep the full-height read small."""
+    resp = sh.values_get(absolute_range_name(tab, "A:A"), params={"valueRenderOption": "UNFORMATTED_VALUE"})
+    return resp.get("values", [])
+
+def load_csv(path: str) -> pd.DataFrame:
+    """
+    Load games CSV restricted to CSV_COLS, stripped, with blanks as "".
+    Skips normalize_df: the CSV comes from scrape_games.py (pandas to_csv), so
+    blanks never show up as odd casings like "nUlL" or whitespace-padded tokens.
+    """
+    df = read_csv_str(path).fillna("")
+    if df.empty:
+        return df
+
+    missing = [c for c in CSV_COLS if c not in df.columns]
+    if missing:
+        raise RuntimeError(f"CSV missing required columns: {missing}. Found: {list(df.columns)}")
+
+    # Fast path: the reader already nulled every blank spelling, so strip is all that's left
+    return df[CSV_COLS].apply(lambda col: col.str.strip())
+
+class _Spreadsheet(gspread.Spreadsheet):
+    """Spreadsheet that keeps the metadata fetched when it is opened."""
+    def fetch_sheet_metadata(self, params=None):
+        self.metadata = super().fetch_sheet_metadata(params)
+        return self.metadata
+
+def get_sheet(sheet_id: str, tab: str):
+    """
+    Open the spreadsheet, failing early if the tab doesn't exist.
+    The tab is checked against the metadata opening already fetched, so
+    this costs no extra round-trip (unlike sh.worksheet(tab)).
+    """
+    gc = get_client()
+    # Same error mapping as gc.open_by_key
+    try:
+        sh = _Spreadsheet(gc.http_client, {"id": sheet_id})
+    except APIError as ex:
+        if ex.response.status_code == HTTPStatus.NOT_FOUND:
+            raise SpreadsheetNotFound(ex.response) from ex
+        if ex.response.status_code == HTTPStatus.FORBIDDEN:
+            raise PermissionError from ex
+        raise
+
+    tabs = [ws["properties"]["title"] for ws in sh.metadata.get("sheets", [])]
+    if tab not in tabs:
+        raise WorksheetNotFound(f"Tab {tab!r} not found in {sh.title!r}. Found: {tabs}")
+    return sh
+
+def existing_row_keys(sh, tab: str, last_a: int, lookback: int) -> Set[str]:
+    """Keys of the last `lookback` rows (A–F) ending at row last_a."""
+    if last_a <= 0 or lookback <= 0:
+        return set()
+    lb_start = max(1, last_a - lookback + 1)
+    resp = sh.values_get(absolute_range_name(tab, f"A{lb_start}:F{last_a}"))
+    existing_rows = resp.get("values", [])
+
+    # Ragged rows (trailing blanks trimmed by Sheets) are padded out to 6 columns
+    existing_df = pd.DataFrame(existing_rows).reindex(columns=range(6))
+    existing_df.columns = CSV_COLS
+    return set(row_keys(normalize_df(existing_df)))
+
+def write_range(sh, tab: str, rng: str, rows: List[List[str]]) -> List[List[str]]:
+    """
+    Write rows exactly at rng and return the cells as Sheets now shows them.
+    Sheets echoes the written values in the same response, so verification
+    costs no extra round-trip.
+    """
+    resp = sh.values_batch_update({
+        "valueInputOption": "USER_ENTERED",
+        "includeValuesInResponse": True,
+        "responseValueRenderOption": "FORMATTED_VALUE",
+        "data": [{"range": absolute_range_name(tab, rng), "values": rows}],
+    })
+    return resp["responses"][0].get("updatedData", {}).get("values", [])
+
 def main():
     ap = argparse.ArgumentParser(description="Append games.csv into first blank row of col A (A–F only), with lookback dedupe + verify.")
     ap.add_argument("--sheet-id", required=True)
@@ -56,48 +163,24 @@ def main():
                     help="How many existing rows (A–F) to scan from the bottom for duplicates (default: 300).")
     args = ap.parse_args()
 
-    df = pd.read_csv(args.csv, dtype=str).fillna("")
+    df = load_csv(args.csv)
     if df.empty:
         print("CSV is empty. Nothing to write.")
         return
 
-    missing = [c for c in CSV_COLS if c not in df.columns]
-    if missing:
-        raise RuntimeError(f"CSV missing required columns: {missing}. Found: {list(df.columns)}")
-
-    df = df[CSV_COLS].copy()
-
-    gc = get_client()
-    sh = gc.open_by_key(args.sheet_id)
-    ws = sh.worksheet(args.tab)
+    sh = get_sheet(args.sheet_id, args.tab)
 
-    last_a = last_nonempty_row_in_col_a(ws)
+    last_a = last_nonempty_row_in_col_a(read_col_a(sh, args.tab))
     start_row = last_a + 1
 
     # ----- Build existing keys from last N rows (A–F) -----
     lookback = max(0, int(args.dedupe_lookback))
-    existing_keys: Set[Tuple[str, ...]] = set()
-
-    if last_a > 0 and lookback > 0:
-        lb_start = max(1, last_a - lookback + 1)
-        lb_range = f"A{lb_start}:F{last_a}"
-        existing_rows = ws.get(lb_range)
-
-        # Ensure each row is length 6
-        for r in existing_rows:
-            r6 = (r + [""] * 6)[:6]
-            existing_keys.add(row_key(r6))
+    existing_keys = existing_row_keys(sh, args.tab, last_a, lookback)
 
     # ----- Prepare new rows, skipping duplicates -----
-    csv_rows = []
-    dupes = 0
-    for _, r in df.iterrows():
-        vals = [normalize(r[c]) for c in CSV_COLS]
-        k = row_key(vals)
-        if k in existing_keys:
-            dupes += 1
-            continue
-        csv_rows.append(vals)
+    is_new = ~row_keys(df).isin(existing_keys)
+    csv_rows = df[is_new].values.tolist()
+    dupes = int((~is_new).sum())
 
     if not csv_rows:
         print(f"✅ Opened sheet: {sh.title}")
@@ -109,20 +192,17 @@ def main():
         return
 
     end_row = start_row + len(csv_rows) - 1
-    write_range = f"A{start_row}:F{end_row}"
+    target_range = f"A{start_row}:F{end_row}"
 
-    # Write exactly where intended
-    ws.update(write_range, csv_rows, value_input_option="USER_ENTERED")
-
-    # Verify by reading back
-    written_back = ws.get(write_range)
+    # Write exactly where intended, reading the result back in the same call
+    written_back = write_range(sh, args.tab, target_range, csv_rows)
 
     print(f"✅ Opened sheet: {sh.title}")
     print(f"✅ Tab: {args.tab}")
     print(f"✅ Last non-empty row in column A: {last_a}")
     print(f"✅ Dedupe lookback: {lookback} row(s)")
     print(f"✅ CSV rows: {len(df)} | duplicates skipped: {dupes} | new rows written: {len(csv_rows)}")
-    print(f"✅ Intended write range: {write_range}")
+    print(f"✅ Intended write range: {target_range}")
     print(f"✅ Rows read back from sheet: {len(written_back)}")
 
     print("\n🔎 First 3 rows read back:")
@@ -134,4 +214,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
@@ -1,15 +1,68 @@
 #!/usr/bin/env python3
 import argparse
+import json
 import os
+import time
 import pandas as pd
 
+import cloudscraper
+import requests
 from kenpompy.utils import login
 import kenpompy.summary as kp
 
+DEFAULT_COOKIE_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "kenpom", "cookies.json")
+
+def load_cached_browser(path: str, ttl_hours: float):
+    """Rebuild a kenpompy browser from cached cookies, or None if missing/stale."""
+    if ttl_hours <= 0 or not os.path.exists(path):
+        return None
+    if time.time() - os.path.getmtime(path) > ttl_hours * 3600:
+        return None
+    try:
+        with open(path) as f:
+            cached = json.load(f)
+        cookies = requests.utils.cookiejar_from_dict(cached["cookies"])
+        user_agent = cached["user_agent"]
+    except Exception:
+        return None
+
+    browser = cloudscraper.create_scraper()
+    # Cloudflare clearance cookies are tied to the User-Agent that earned them
+    browser.headers["User-Agent"] = user_agent
+    browser.cookies.update(cookies)
+    return browser
+
+def save_browser(browser, path: str):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as f:
+        json.dump({"cookies": requests.utils.dict_from_cookiejar(browser.cookies),
+                   "user_agent": browser.headers.get("User-Agent")}, f)
+    os.replace(tmp, path)
+
+def is_logged_in(browser) -> bool:
+    # Same check kenpompy's login() uses; a logged-out session would otherwise
+    # hand back whatever table the public page shows.
+    try:
+        return "Logged in as" in browser.get("https://kenpom.com/").text
+    except Exception:
+        return False
+
+def fetch_efficiency(browser, season):
+    if season is None:
+        return kp.get_efficiency(browser)
+    # kenpompy accepts season as str/int depending on version; str is safest
+    return kp.get_efficiency(browser, season=str(season))
+
 def main():
     ap = argparse.ArgumentParser(description="Fetch KenPom efficiency table via kenpompy and save raw CSV.")
     ap.add_argument("--out", default="kenpom.csv")
     ap.add_argument("--season", type=int, default=None, help="Season year (e.g., 2026). Omit for current season.")
+    ap.add_argument("--cookie-cache", default=DEFAULT_COOKIE_CACHE,
+                    help=f"Where to cache the logged-in session cookies (default: {DEFAULT_COOKIE_CACHE}).")
+    ap.add_argument("--cookie-ttl-hours", type=float, default=12,
+                    help="Reuse cached cookies younger than this; 0 always logs in (default: 12). "
+                         "Only helps on persistent runners / local reruns; CI runners start empty.")
     args = ap.parse_args()
 
     user = os.environ.get("KENPOM_USER")
@@ -17,13 +70,17 @@ def main():
     if not user or not pw:
         raise RuntimeError("Missing KENPOM_USER or KENPOM_PASS env vars.")
 
-    browser = login(user, pw)
+    browser = load_cached_browser(args.cookie_cache, args.cookie_ttl_hours)
+    if browser is not None and not is_logged_in(browser):
+        print("ℹ️ Cached KenPom session rejected; logging in again.")
+        browser = None
+    if browser is None:
+        browser = login(user, pw)
 
-    if args.season is None:
-        df = kp.get_efficiency(browser)
-    else:
-        # kenpompy accepts season as str/int depending on version; str is safest
-        df = kp.get_efficiency(browser, season=str(args.season))
+    df = fetch_efficiency(browser, args.season)
+    if df is not None and not df.empty:
+        # Re-saving refreshes the TTL for as long as the session keeps working
+        save_browser(browser, args.cookie_cache)
 
     if df is None or df.empty:
         raise RuntimeError("KenPom efficiency table returned empty. Login may have failed or page format changed.")
@@ -35,4 +92,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
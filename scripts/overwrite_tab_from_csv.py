@@ -1,24 +1,49 @@
 #!/usr/bin/env python3
 import argparse
-import json
+import csv
 import os
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pac
 import gspread
+import orjson
+from gspread.utils import rowcol_to_a1
 from google.oauth2.service_account import Credentials
 
 SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
 
 def get_client():
-    sa_json = json.loads(os.environ["GOOGLE_SA_JSON"])
+    sa_json = orjson.loads(os.environ["GOOGLE_SA_JSON"])
     creds = Credentials.from_service_account_info(sa_json, scopes=SCOPES)
     return gspread.authorize(creds)
 
-def norm(x):
-    if x is None:
-        return ""
-    s = str(x).strip()
-    return "" if s.lower() in ("nan", "none", "null") else s
+# Cell values treated as blank (compared after strip + lower)
+_NULL_STRS = frozenset({"nan", "none", "null", ""})
+
+def normalize_col(col: pd.Series) -> pd.Series:
+    s = col.fillna("").astype(str).str.strip()
+    return s.mask(s.str.lower().isin(_NULL_STRS), "")
+
+def normalize_df(df: pd.DataFrame) -> pd.DataFrame:
+    """Apply normalize_col to every column."""
+    out = df.copy()
+    for c in out.columns:
+        out[c] = normalize_col(out[c])
+    return out
+
+# Arrow's default null tokens plus the None/Null spellings it doesn't cover
+_CSV_NULL_VALUES = pac.ConvertOptions().null_values + ["None", "none", "NONE", "Null", "NAN"]
+
+def read_csv_str(path: str) -> pd.DataFrame:
+    """
+    Parse the CSV with PyArrow, keeping every column as strings (empty/NA-like cells become nulls).
+    """
+    with open(path, newline="") as f:
+        header = next(csv.reader(f), [])
+    opts = pac.ConvertOptions(column_types={c: pa.string() for c in header}, strings_can_be_null=True,
+                               null_values=_CSV_NULL_VALUES)
+    return pac.read_csv(path, convert_options=opts).to_pandas(types_mapper=pd.ArrowDtype)
 
 def main():
     ap = argparse.ArgumentParser(description="Overwrite a sheet tab with CSV contents starting at A1.")
@@ -29,39 +54,34 @@ def main():
                     help="How many extra rows to blank out below new data (default 500).")
     args = ap.parse_args()
 
-    df = pd.read_csv(args.csv, dtype=str).fillna("")
+    # --csv can be any file, not just our own output, so padded or oddly cased
+    # null tokens like " none " still need the full mask
+    df = normalize_df(read_csv_str(args.csv))
     gc = get_client()
     sh = gc.open_by_key(args.sheet_id)
     ws = sh.worksheet(args.tab)
 
     # Build values: header row + data rows
-    values = [list(df.columns)] + df.apply(lambda col: col.map(norm)).values.tolist()
+    values = [list(df.columns)] + df.values.tolist()
 
     end_row = len(values)
     end_col = len(values[0])
 
-    # Convert column count to A1 notation end column
-    # gspread can update by range like "A1:ZZ1000" as long as you compute the end col.
-    def col_letter(n: int) -> str:
-        s = ""
-        while n > 0:
-            n, r = divmod(n - 1, 26)
-            s = chr(65 + r) + s
-        return s
-
-    end_col_letter = col_letter(end_col)
-    rng = f"A1:{end_col_letter}{end_row}"
+    # Convert the bottom-right cell to A1 notation once; the column letter is reused below.
+    end_cell = rowcol_to_a1(end_row, end_col)
+    end_col_letter = end_cell.rstrip("0123456789")
+    rng = f"A1:{end_cell}"
 
     # Clear then write (values only)
     ws.clear()
     ws.update(rng, values, value_input_option="USER_ENTERED")
 
-    # Optional: blank some extra rows below in case yesterday had more rows/cols
+    # Optional: blank some extra rows below in case yesterday had more rows/cols.
+    # batch_clear sends only the range, not a grid of empty strings.
     if args.clear_below > 0:
         blank_start = end_row + 1
         blank_end = end_row + args.clear_below
-        blank_rng = f"A{blank_start}:{end_col_letter}{blank_end}"
-        ws.update(blank_rng, [[""] * end_col] * args.clear_below, value_input_option="USER_ENTERED")
+        ws.batch_clear([f"A{blank_start}:{end_col_letter}{blank_end}"])
 
     print(f"✅ Overwrote tab '{args.tab}' with {len(df)} rows and {len(df.columns)} cols.")
     print(f"✅ Wrote range: {rng}")
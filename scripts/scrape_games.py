@@ -1,10 +1,24 @@
 #!/usr/bin/env python3
 import argparse
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+from typing import Optional
+from zoneinfo import ZoneInfo
+
 import requests
+from requests.adapters import HTTPAdapter
+import numpy as np
+import orjson
 import pandas as pd
 
 ESPN_SCOREBOARD = "https://site.api.espn.com/apis/site/v2/sports/basketball/mens-college-basketball/scoreboard"
 
+# Shared across worker threads so per-day scrapes reuse pooled connections
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+
 def safe_get(d, path, default=None):
     cur = d
     try:
@@ -14,27 +28,54 @@ def safe_get(d, path, default=None):
     except Exception:
         return default
 
-def clean(s):
-    if s is None:
-        return ""
-    s = str(s).strip()
-    return "" if s.lower() in ("", "nan", "none", "null") else s
-
-def combine_location(venue: dict) -> str:
-    name  = clean(safe_get(venue, ["fullName"]))
-    city  = clean(safe_get(venue, ["address", "city"]))
-    state = clean(safe_get(venue, ["address", "state"]))
-    place = ", ".join([p for p in (city, state) if p])
-    return f"{name} — {place}" if name and place else (name or place)
+# Cell values treated as blank (compared after strip + lower)
+_NULL_STRS = frozenset({"nan", "none", "null", ""})
+
+def normalize_col(col: pd.Series) -> pd.Series:
+    s = col.fillna("").astype(str).str.strip()
+    return s.mask(s.str.lower().isin(_NULL_STRS), "")
+
+def combine_location(name: pd.Series, city: pd.Series, state: pd.Series) -> pd.Series:
+    name, city, state = normalize_col(name), normalize_col(city), normalize_col(state)
+    place = (city + ", " + state).where((city != "") & (state != ""), city + state)
+    return (name + " — " + place).where((name != "") & (place != ""), name + place)
+
+def scoreboard_cache_path(date_yyyymmdd: str, cache_dir) -> Optional[str]:
+    """Cache file for a date, or None if caching is off or the date isn't over yet in ET."""
+    if not cache_dir:
+        return None
+    today_et = datetime.now(ZoneInfo("America/New_York")).strftime("%Y%m%d")
+    if date_yyyymmdd >= today_et:
+        return None
+    return os.path.join(cache_dir, f"{date_yyyymmdd}.json")
+
+def write_scoreboard_cache(path: str, sb_json: dict):
+    # Only cache once every event is final; a suspended or delayed game would
+    # otherwise be frozen in its partial state. An empty day may be a transient
+    # empty response from ESPN, so it is never cached either.
+    events = sb_json["events"]
+    if not events or any(safe_get(ev, ["status", "type", "state"]) != "post" for ev in events):
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(orjson.dumps(sb_json))
+    os.replace(tmp, path)
 
-def fetch_scoreboard_all(date_yyyymmdd: str, timeout=20, page_size=200) -> dict:
+def fetch_scoreboard_all(date_yyyymmdd: str, timeout=20, page_size=500, session=None, cache_dir=None) -> dict:
     """
     Pull ALL Division I events for a given date by paging ESPN's scoreboard.
     - groups=50 => NCAA Division I
-    - limit/offset paging until no new events
+    - limit/offset paging until no new events (a full D-I day usually fits in one page)
     - tz pinned so 'dates' aligns to ET
+    - past dates are served from / saved to cache_dir when given
     """
-    session = requests.Session()
+    cache_path = scoreboard_cache_path(date_yyyymmdd, cache_dir)
+    if cache_path and os.path.exists(cache_path):
+        with open(cache_path, "rb") as f:
+            return orjson.loads(f.read())
+
+    session = session or SESSION
     all_events, seen = [], set()
     offset = 0
 
@@ -50,7 +91,7 @@ def fetch_scoreboard_all(date_yyyymmdd: str, timeout=20, page_size=200) -> dict:
                         headers={"User-Agent": "Mozilla/5.0 (CBB scraper)"},
                         timeout=timeout)
         r.raise_for_status()
-        data = r.json()
+        data = orjson.loads(r.content)
         events = data.get("events", []) or []
         if not events:
             break
@@ -65,94 +106,102 @@ def fetch_scoreboard_all(date_yyyymmdd: str, timeout=20, page_size=200) -> dict:
 
         if new == 0 or len(events) < page_size:
             break
+        # Skip the confirming fetch when ESPN reports the total and we already have it
+        total = data.get("eventsCount")
+        if total and len(all_events) >= int(total):
+            break
 
         offset += page_size
 
-    return {"events": all_events}
-
-def parse_completed_games(sb_json: dict):
+    sb_json = {"events": all_events}
+    if cache_path:
+        write_scoreboard_cache(cache_path, sb_json)
+    return sb_json
+
+# Flattened competitor-level fields pulled from each competition
+COMP_META = [
+    "_event",
+    "neutralSite",
+    ["venue", "fullName"],
+    ["venue", "address", "city"],
+    ["venue", "address", "state"],
+    ["status", "type", "completed"],
+]
+FLAT_COLS = [
+    "homeAway", "score", "team.displayName", "_event", "neutralSite",
+    "venue.fullName", "venue.address.city", "venue.address.state",
+    "status.type.completed",
+]
+GAME_COLS = ["home_team", "home_score", "away_team", "away_score", "is_neutral", "location"]
+
+def parse_completed_games(sb_json: dict) -> pd.DataFrame:
     """
-    Yield dicts for completed games with keys:
+    Return a DataFrame of completed games with columns:
     home_team, home_score, away_team, away_score, is_neutral, location
     """
     events = sb_json.get("events", []) or []
-    for ev in events:
-        comps = ev.get("competitions", []) or []
-        if not comps:
-            continue
-        comp = comps[0]
-
-        completed = bool(safe_get(comp, ["status", "type", "completed"], False))
-        if not completed:
-            continue
-
-        competitors = comp.get("competitors", []) or []
-        if len(competitors) != 2:
-            continue
-
-        neutral = bool(comp.get("neutralSite", False))
-        venue = comp.get("venue", {}) or {}
-        location = combine_location(venue)
-
-        rec = {"is_neutral": neutral, "location": location}
-        for c in competitors:
-            side = c.get("homeAway")  # 'home' or 'away'
-            team_name = clean(safe_get(c, ["team", "displayName"]))
-            try:
-                score = int(c.get("score")) if c.get("score") is not None else None
-            except Exception:
-                score = None
-
-            if side == "home":
-                rec["home_team"] = team_name
-                rec["home_score"] = score
-            elif side == "away":
-                rec["away_team"] = team_name
-                rec["away_score"] = score
-
-        if any(k not in rec for k in ("home_team", "away_team", "home_score", "away_score")):
-            continue
-        if rec["home_score"] is None or rec["away_score"] is None:
-            continue
-
-        yield rec
-
-def build_rows(games_iter):
-    rows = []
-    for g in games_iter:
-        home_win = g["home_score"] > g["away_score"]
-        winner_team  = g["home_team"] if home_win else g["away_team"]
-        winner_score = max(g["home_score"], g["away_score"])
-        loser_team   = g["away_team"] if home_win else g["home_team"]
-        loser_score  = min(g["home_score"], g["away_score"])
-
-        if g["is_neutral"]:
-            site = "N"
-        else:
-            site = "H" if home_win else "A"
-
-        rows.append({
-            "winner_team":  winner_team,
-            "winner_score": winner_score,
-            "loser_team":   loser_team,
-            "loser_score":  loser_score,
-            "location":     g["location"],
-            "site_designation": site
-        })
-    return rows
-
-def scrape_one_day(date_iso: str):
+    # Only the first competition of each event counts
+    comps = []
+    for i, ev in enumerate(events):
+        comp = (ev.get("competitions", []) or [None])[0]
+        if comp:
+            comps.append({**comp, "_event": i, "competitors": comp.get("competitors", []) or []})
+    if not comps:
+        return pd.DataFrame(columns=GAME_COLS)
+
+    # One row per competitor, carrying its competition's fields alongside
+    flat = pd.json_normalize(comps, record_path="competitors", meta=COMP_META, errors="ignore")
+    flat = flat.reindex(columns=FLAT_COLS)
+
+    completed = flat["status.type.completed"].fillna(False).astype(bool)
+    two_teams = flat.groupby("_event")["_event"].transform("size") == 2
+    flat = flat[completed & two_teams]
+
+    flat = flat.assign(
+        team=normalize_col(flat["team.displayName"]),
+        score=pd.to_numeric(flat["score"], errors="coerce"),
+    ).set_index("_event")
+    home = flat[flat["homeAway"] == "home"]
+    away = flat[flat["homeAway"] == "away"]
+
+    games = home.join(away[["team", "score"]], how="inner", lsuffix="_home", rsuffix="_away")
+    games = games.dropna(subset=["score_home", "score_away"]).sort_index()
+
+    return pd.DataFrame({
+        "home_team":  games["team_home"],
+        "home_score": games["score_home"].astype(int),
+        "away_team":  games["team_away"],
+        "away_score": games["score_away"].astype(int),
+        "is_neutral": games["neutralSite"].fillna(False).astype(bool),
+        "location":   combine_location(games["venue.fullName"], games["venue.address.city"],
+                                       games["venue.address.state"]),
+    }, columns=GAME_COLS).reset_index(drop=True)
+
+def build_rows(games: pd.DataFrame) -> pd.DataFrame:
+    hs, as_ = games["home_score"].to_numpy(), games["away_score"].to_numpy()
+    ht, at_ = games["home_team"].to_numpy(), games["away_team"].to_numpy()
+    neutral = games["is_neutral"].to_numpy(dtype=bool)
+
+    home_win = hs > as_
+    return pd.DataFrame({
+        "winner_team":  np.where(home_win, ht, at_),
+        "winner_score": np.maximum(hs, as_),
+        "loser_team":   np.where(home_win, at_, ht),
+        "loser_score":  np.minimum(hs, as_),
+        "location":     games["location"].to_numpy(),
+        "site_designation": np.where(neutral, "N", np.where(home_win, "H", "A")),
+    })
+
+def scrape_one_day(date_iso: str, cache_dir=None):
     """Return a DataFrame of completed D-I games for a single ISO date."""
     date_compact = date_iso.replace("-", "")
     display_date = pd.to_datetime(date_iso).strftime("%m-%d-%Y")
 
-    sb = fetch_scoreboard_all(date_compact)
-    games = list(parse_completed_games(sb))
-    rows = build_rows(games)
-
-    df = pd.DataFrame(rows, columns=[
+    sb = fetch_scoreboard_all(date_compact, cache_dir=cache_dir)
+    games = parse_completed_games(sb)
+    df = build_rows(games)[[
         "winner_team","winner_score","loser_team","loser_score","site_designation"
-    ])
+    ]]
     if not df.empty:
         df.insert(0, "date", display_date)
     return df
@@ -163,6 +212,8 @@ def main():
     ap.add_argument("--end-date", help="End date in YYYY-MM-DD (inclusive). If omitted, only the start date is scraped.")
     ap.add_argument("-o", "--out", help="Combined output CSV (default: update_for_YYYYMMDD.csv or update_for_YYYYMMDD_YYYYMMDD.csv for ranges)")
     ap.add_argument("--per-day", action="store_true", help="Also write a per-day CSV for each date")
+    ap.add_argument("--workers", type=int, default=8, help="Days to scrape concurrently (default: 8)")
+    ap.add_argument("--cache-dir", help="Cache ESPN responses for past dates here and reuse them on reruns")
     args = ap.parse_args()
 
     start_iso = args.date
@@ -174,8 +225,12 @@ def main():
     all_frames = []
     total_games = 0
 
-    for d_iso in dates:
-        df_day = scrape_one_day(d_iso)
+    # Days are independent and network-bound; fetch them concurrently and
+    # handle results in date order.
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as ex:
+        frames = list(ex.map(partial(scrape_one_day, cache_dir=args.cache_dir), dates))
+
+    for d_iso, df_day in zip(dates, frames):
         if args.per_day:
             # write per-day file
             compact = d_iso.replace("-", "")
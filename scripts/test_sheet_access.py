@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
-import json
 import os
 
 import gspread
+import orjson
+from gspread.utils import absolute_range_name
 from google.oauth2.service_account import Credentials
 
 SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
@@ -11,7 +12,7 @@ SHEET_ID = os.environ["SHEET_ID"]
 TAB_NAME = os.environ.get("TAB_NAME", "Games")
 
 def main():
-    sa_json = json.loads(os.environ["GOOGLE_SA_JSON"])
+    sa_json = orjson.loads(os.environ["GOOGLE_SA_JSON"])
     creds = Credentials.from_service_account_info(sa_json, scopes=SCOPES)
     gc = gspread.authorize(creds)
 
@@ -22,16 +23,17 @@ def main():
     col_a = ws.col_values(1)  # returns values up to last non-empty cell
     last_row = len(col_a)
 
-    print(f"✅ Opened sheet: {sh.title}")
-    print(f"✅ Opened tab: {TAB_NAME}")
-    print(f"✅ Column A last non-empty row: {last_row}")
-    print(f"✅ Header (row 1): {ws.row_values(1)}")
-
-    # Print last 5 rows of the first 6 columns (A:F), if available
+    # Fetch the header row and the last 5 rows of A:F (if available) in one call
     start = max(2, last_row - 4)
     end = last_row
     rng = f"A{start}:F{end}"
-    tail = ws.get(rng)
+    resp = sh.values_batch_get([absolute_range_name(ws.title, "1:1"), absolute_range_name(ws.title, rng)])
+    header, tail = (vr.get("values", []) for vr in resp["valueRanges"])
+
+    print(f"✅ Opened sheet: {sh.title}")
+    print(f"✅ Opened tab: {TAB_NAME}")
+    print(f"✅ Column A last non-empty row: {last_row}")
+    print(f"✅ Header (row 1): {header[0] if header else []}")
 
     print(f"\nLast rows preview ({rng}):")
     for r in tail:
@@ -1,13 +1,13 @@
 import argparse
-import json
 import pandas as pd
 import gspread
+import orjson
 from google.oauth2.service_account import Credentials
 
 SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
 
 def load_client():
-    sa_json = json.loads(__import__("os").environ["GOOGLE_SA_JSON"])
+    sa_json = orjson.loads(__import__("os").environ["GOOGLE_SA_JSON"])
     creds = Credentials.from_service_account_info(sa_json, scopes=SCOPES)
     return gspread.authorize(creds)
 